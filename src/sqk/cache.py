@@ -0,0 +1,126 @@
+# Copyright (c) 2025 kynguyen and contributors. All rights reserved.
+# Licensed under the MIT license. See LICENSE file in the project root for details.
+
+"""On-disk cache of transform results keyed by source content.
+
+Repeated runs (pre-commit, editor integrations) mostly see files that have
+not changed since the previous run. Results are stored by a digest of the
+source text and the tool version so those files skip parse and transform.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field
+from importlib.metadata import PackageNotFoundError, version
+from pathlib import Path
+
+from .constants import CACHE_DIR_ENV, CACHE_FILE_NAME, CACHE_MAX_ENTRIES
+
+try:
+    _TOOL_VERSION = version("single-quote-keys")
+except PackageNotFoundError:  # pragma: no cover - running from a source tree
+    _TOOL_VERSION = "0"
+
+
+def default_cache_dir() -> Path | None:
+    """Return the cache directory, honouring ``SQK_CACHE_DIR`` and XDG.
+
+    Returns ``None`` when no home directory can be resolved, in which case
+    the tool runs without a cache.
+    """
+    override = os.environ.get(CACHE_DIR_ENV)
+    if override:
+        return Path(override)
+    xdg = os.environ.get("XDG_CACHE_HOME")
+    if xdg:
+        return Path(xdg) / "sqk"
+    try:
+        home = Path.home()
+    except RuntimeError:
+        return None
+    return home / ".cache" / "sqk"
+
+
+# Digest state after hashing the tool version; copied for every key. SHA-1 is
+# used for speed only: it is the fastest stdlib digest with hardware support.
+_KEY_PREFIX = hashlib.sha1(f"{_TOOL_VERSION}\0".encode(), usedforsecurity=False)
+
+
+def cache_key(code: str) -> str:
+    """Return the cache key for source ``code``."""
+    digest = _KEY_PREFIX.copy()
+    digest.update(code.encode("utf-8", "surrogatepass"))
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class ResultCache:
+    """Mapping of cache keys to ``(changed, new_code)`` results.
+
+    ``new_code`` is only stored for sources that change; unchanged sources
+    are recorded with ``None`` and callers reuse the original text. Entries
+    are kept in least- to most-recently-used order.
+    """
+
+    path: Path
+    entries: dict[str, tuple[bool, str | None]] = field(default_factory=dict)
+    dirty: bool = False
+    # Keys looked up or recorded during this run; never pruned by ``save``.
+    used: set[str] = field(default_factory=set)
+
+    @classmethod
+    def load(cls, directory: Path) -> ResultCache:
+        """Load the cache stored in ``directory``; start empty if unreadable."""
+        path = directory / CACHE_FILE_NAME
+        try:
+            raw = json.loads(path.read_text())
+            entries = {
+                key: (bool(changed), code) for key, (changed, code) in raw.items()
+            }
+        except (OSError, ValueError, TypeError, AttributeError):
+            return cls(path=path)
+        return cls(path=path, entries=entries)
+
+    def get(self, key: str) -> tuple[bool, str | None] | None:
+        """Return the cached result for ``key`` or ``None`` on a miss."""
+        result = self.entries.pop(key, None)
+        if result is not None:
+            # Re-insert so recently used entries survive pruning in ``save``;
+            # the new order has to be written back for that to last.
+            self.entries[key] = result
+            self.used.add(key)
+            self.dirty = True
+        return result
+
+    def put(self, key: str, changed: bool, code: str | None) -> None:
+        """Record the result for ``key``."""
+        self.entries[key] = (changed, code if changed else None)
+        self.used.add(key)
+        self.dirty = True
+
+    def save(self) -> None:
+        """Persist the cache atomically; failures leave the old file in place."""
+        if not self.dirty:
+            return
+        # Keep the most recently used entries only, but never drop one used in
+        # this run: those sit at the end, so they all fit in the slice.
+        keep = max(CACHE_MAX_ENTRIES, len(self.used))
+        keys = list(self.entries)[-keep:]
+        payload = {key: list(self.entries[key]) for key in keys}
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.path.parent, suffix=".tmp")
+        except OSError:
+            return
+        try:
+            with os.fdopen(fd, "w") as fh:
+                json.dump(payload, fh)
+            Path(tmp).replace(self.path)
+        except OSError:
+            Path(tmp).unlink(missing_ok=True)
+            return
+        self.dirty = False
@@ -6,11 +6,15 @@
 from __future__ import annotations
 
 import argparse
+import os
 import sys
 from pathlib import Path
 
+from .cache import ResultCache, default_cache_dir
 from .config import Config
-from .processor import process_file
+from .constants import GIT_LS_FILES_ENV
+from .filesystem import git_ls_python_files, write_text_atomic
+from .processor import process_files
 
 
 def build_parser() -> argparse.ArgumentParser:
@@ -24,6 +28,18 @@ def build_parser() -> argparse.ArgumentParser:
         action="store_true",
         help="Apply fixes in-place; exits non-zero if any changes were applied",
     )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Do not read or write the on-disk result cache",
+    )
+    p.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="Number of worker processes (default: number of CPUs)",
+    )
     return p
 
 
@@ -31,27 +47,38 @@ def main(argv: list[str] | None = None) -> int:
     """Run the CLI with ``argv``; returns process exit code.
 
     If ``--fix`` is provided, changes are written in-place. Otherwise, prints the
-    file paths that would change and returns non-zero.
+    file paths that would change and returns non-zero. With
+    ``SQK_USE_GIT_LS_FILES=1`` the files are taken from ``git ls-files``,
+    using ``paths`` as pathspecs.
     """
     argv = argv if argv is not None else sys.argv[1:]
     args = build_parser().parse_args(argv)
     config = Config.discover(Path.cwd())
+    cache_dir = None if args.no_cache else default_cache_dir()
+    cache = None if cache_dir is None else ResultCache.load(cache_dir)
+
+    paths: list[str] = args.paths
+    if os.environ.get(GIT_LS_FILES_ENV) == "1":
+        tracked = git_ls_python_files(paths)
+        if tracked is not None:
+            paths = tracked
+
+    python_paths = [raw for raw in paths if raw.endswith(".py")]
+    candidates = [Path(raw) for raw in config.filter_paths(python_paths)]
+    jobs = args.jobs or os.cpu_count() or 1
 
     any_changed = False
-    for raw in args.paths:
-        path = Path(raw)
-        if not path.exists() or path.suffix != ".py":
-            continue
-        if config.is_excluded(path):
-            continue
-        result = process_file(path)
+    for result in process_files(candidates, cache, jobs):
         if result.changed:
             any_changed = True
             if args.fix:
-                path.write_text(result.code)
+                write_text_atomic(result.path, result.code)
             else:
                 # Print unified diff-like output (filename only) for pre-commit to mark failure
-                sys.stdout.write(f"{path}\n")
+                sys.stdout.write(f"{result.path}\n")
+
+    if cache is not None:
+        cache.save()
 
     # In both dry-run and --fix modes, if changes were (or would be) made, exit non-zero
     return 1 if any_changed else 0
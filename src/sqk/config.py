@@ -5,21 +5,29 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import os
+from dataclasses import dataclass, field
 from typing import TYPE_CHECKING
 
-from .filesystem import read_pyproject_excludes
+from .filesystem import compile_excludes, read_pyproject_excludes
 
 if TYPE_CHECKING:
+    import re
+    from collections.abc import Iterable
     from pathlib import Path
 
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class Config:
     """Resolved configuration for the tool."""
 
     project_root: Path
     excludes: tuple[str, ...]
+    exclude_regex: re.Pattern[str] | None = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        """Compile ``excludes`` once so per-file checks are a single search."""
+        object.__setattr__(self, "exclude_regex", compile_excludes(self.excludes))
 
     @classmethod
     def discover(cls, start: Path) -> Config:
@@ -29,6 +37,20 @@ class Config:
 
     def is_excluded(self, path: Path) -> bool:
         """Return True if ``path`` is excluded by config patterns."""
-        from .filesystem import is_path_excluded
-
-        return is_path_excluded(path, self.excludes)
+        if self.exclude_regex is None:
+            return False
+        return self.exclude_regex.search(path.as_posix()) is not None
+
+    def filter_paths(self, paths: Iterable[str]) -> list[str]:
+        """Return the entries of ``paths`` that are not excluded.
+
+        Works on the path strings as given (e.g. by pre-commit), so no
+        ``Path`` object is built for files that end up excluded.
+        """
+        if self.exclude_regex is None:
+            return list(paths)
+        search = self.exclude_regex.search
+        if os.altsep is not None:
+            # Windows: accept either separator, as ``Path.as_posix`` would.
+            return [p for p in paths if not search(p.replace(os.sep, "/"))]
+        return [p for p in paths if not search(p)]
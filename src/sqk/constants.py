@@ -11,13 +11,26 @@ PYPROJECT_TOOL_SECTION = "tool.single-quote-keys"
 OPT_OUT_KEY = "exclude"
 TEXTUAL_DOUBLE_QUOTED = True
 
+# Result cache location and size.
+CACHE_DIR_ENV = "SQK_CACHE_DIR"
+CACHE_FILE_NAME = "results.json"
+CACHE_MAX_ENTRIES = 10_000
+
+# Set to "1" to let the CLI discover files with ``git ls-files``.
+GIT_LS_FILES_ENV = "SQK_USE_GIT_LS_FILES"
+
 # Supported call names for key-arg transformations
-ATTR_FUNCS = {"getattr", "hasattr", "setattr", "delattr"}
-MAPPING_FIRST_KEY_METHODS = {"get", "pop", "setdefault"}
-OPERATOR_GETTERS = {"attrgetter", "itemgetter", "methodcaller"}
-FROM_KEYS = {"fromkeys"}
-DICT_CONSTRUCTORS = {"dict", "OrderedDict", "collections.OrderedDict"}
+ATTR_FUNCS = frozenset({"getattr", "hasattr", "setattr", "delattr"})
+MAPPING_FIRST_KEY_METHODS = frozenset({"get", "pop", "setdefault"})
+OPERATOR_GETTERS = frozenset({"attrgetter", "itemgetter", "methodcaller"})
+FROM_KEYS = frozenset({"fromkeys"})
+DICT_CONSTRUCTORS = frozenset({"dict", "OrderedDict", "collections.OrderedDict"})
 
 # Dunder methods
-DUUNDER_KEY = {"__getitem__", "__setitem__"}
-DUUNDER_ATTR = {"__getattr__", "__setattr__", "__delattr__", "__getattribute__"}
+DUUNDER_KEY = frozenset({"__getitem__", "__setitem__"})
+DUUNDER_ATTR = frozenset({
+    "__getattr__",
+    "__setattr__",
+    "__delattr__",
+    "__getattribute__",
+})
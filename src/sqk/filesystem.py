@@ -5,6 +5,11 @@
 
 from __future__ import annotations
 
+import functools
+import os
+import re
+import subprocess  # noqa: S404
+import tempfile
 import tomllib
 from pathlib import Path
 from typing import TYPE_CHECKING
@@ -12,7 +17,7 @@ from typing import TYPE_CHECKING
 from .constants import OPT_OUT_KEY
 
 if TYPE_CHECKING:
-    from collections.abc import Iterable
+    from collections.abc import Iterable, Sequence
 
 
 def read_pyproject_excludes(start: Path) -> set[str]:
@@ -24,22 +29,141 @@ def read_pyproject_excludes(start: Path) -> set[str]:
     proj = find_pyproject_toml(start)
     if proj is None:
         return set()
+    stat = proj.stat()
+    return set(_load_pyproject_excludes(proj, stat.st_mtime_ns, stat.st_size))
+
+
+@functools.lru_cache(maxsize=32)
+def _load_pyproject_excludes(
+    proj: Path,
+    _mtime_ns: int,
+    _size: int,
+) -> frozenset[str]:
+    """Parse ``proj`` once per ``(path, mtime, size)`` and return its excludes."""
     raw = tomllib.loads(proj.read_text())
     section = raw.get("tool", {}).get("single-quote-keys", {})
     excludes = section.get(OPT_OUT_KEY, [])
-    return set(excludes or [])
+    return frozenset(excludes or [])
 
 
 def is_path_excluded(path: Path, patterns: Iterable[str]) -> bool:
     """Return True if ``path`` matches any exclusion glob in ``patterns``."""
-    as_posix = path.as_posix()
-    return any(Path(as_posix).match(pat) for pat in patterns)
+    regex = compile_excludes(patterns)
+    return regex is not None and regex.search(path.as_posix()) is not None
+
+
+def compile_excludes(patterns: Iterable[str]) -> re.Pattern[str] | None:
+    """Compile exclusion globs into one regex searched against POSIX paths.
+
+    Matching follows ``PurePath.match``: relative patterns match from the
+    right, absolute patterns must match the whole path, and wildcards never
+    cross a ``/`` (``**`` behaves like ``*``). Returns ``None`` if there are
+    no patterns.
+    """
+    return _compile_excludes(frozenset(patterns))
+
+
+@functools.lru_cache(maxsize=32)
+def _compile_excludes(patterns: frozenset[str]) -> re.Pattern[str] | None:
+    parts = [_glob_to_regex(pat) for pat in sorted(patterns) if pat]
+    if not parts:
+        return None
+    flags = re.IGNORECASE if os.name == "nt" else 0
+    return re.compile("|".join(parts), flags)
+
+
+def _glob_to_regex(pattern: str) -> str:
+    """Translate a single ``PurePath.match`` glob into a regex fragment."""
+    segments = [seg for seg in pattern.split("/") if seg and seg != "."]
+    # Each segment must consume at least one character, so a leading ``*``
+    # cannot match the empty name before the root ``/``.
+    body = "/".join(f"(?=[^/]){_segment_to_regex(seg)}" for seg in segments)
+    if pattern.startswith("/"):
+        return rf"(?:\A/{body}\Z)"
+    return rf"(?:(?:\A|/){body}\Z)"
+
+
+def _segment_to_regex(segment: str) -> str:
+    """Translate one path segment of a glob; wildcards stop at ``/``."""
+    out: list[str] = []
+    i, n = 0, len(segment)
+    while i < n:
+        c = segment[i]
+        i += 1
+        if c == "*":
+            # Collapse runs of ``*`` (including ``**``) into one wildcard.
+            while i < n and segment[i] == "*":
+                i += 1
+            out.append("[^/]*")
+        elif c == "?":
+            out.append("[^/]")
+        elif c == "[":
+            translated, i = _class_to_regex(segment, i)
+            out.append(translated)
+        else:
+            out.append(re.escape(c))
+    return "".join(out)
+
+
+def _class_to_regex(segment: str, start: int) -> tuple[str, int]:
+    """Translate a ``[...]`` class opened just before ``start``.
+
+    Returns the regex and the index after the class; an unterminated ``[``
+    is taken literally. Ranges follow ``fnmatch.translate``: a reversed
+    range is dropped rather than handed to ``re``.
+    """
+    n = len(segment)
+    j = start
+    if j < n and segment[j] == "!":
+        j += 1
+    if j < n and segment[j] == "]":
+        j += 1
+    while j < n and segment[j] != "]":
+        j += 1
+    if j >= n:
+        return r"\[", start
+    chunks = _range_chunks(segment[start:j])
+    stuff = "-".join(re.sub(r"([\\\]&~|-])", r"\\\1", chunk) for chunk in chunks)
+    if not stuff:
+        return "(?!)", j + 1
+    if stuff == "!":
+        return "[^/]", j + 1
+    if stuff.startswith("!"):
+        stuff = "^/" + stuff[1:]
+    elif stuff.startswith(("^", "[")):
+        stuff = "\\" + stuff
+    return f"[{stuff}]", j + 1
+
+
+def _range_chunks(stuff: str) -> list[str]:
+    """Split a class body on its range hyphens, dropping reversed ranges.
+
+    Joining the chunks with ``-`` gives back the remaining ranges; any other
+    hyphen stays inside its chunk as a literal member.
+    """
+    chunks: list[str] = []
+    i = 0
+    k = 2 if stuff.startswith("!") else 1
+    while (k := stuff.find("-", k)) >= 0:
+        chunks.append(stuff[i:k])
+        i = k + 1
+        k += 3
+    if stuff[i:]:
+        chunks.append(stuff[i:])
+    else:
+        chunks[-1] += "-"
+    for k in range(len(chunks) - 1, 0, -1):
+        if chunks[k - 1][-1] > chunks[k][0]:
+            chunks[k - 1] = chunks[k - 1][:-1] + chunks[k][1:]
+            del chunks[k]
+    return [chunk for chunk in chunks if chunk]
 
 
 def find_pyproject_toml(start: Path) -> Path | None:
     """Find the nearest ``pyproject.toml`` starting at or above ``start``.
 
-    Returns the path if found, otherwise ``None``.
+    Returns the path if found, otherwise ``None``. The lookup is not memoized,
+    so a file created or deleted since the last call is seen.
     """
     cur = start
     for p in [cur, *cur.parents]:
@@ -47,3 +171,42 @@ def find_pyproject_toml(start: Path) -> Path | None:
         if candidate.exists():
             return candidate
     return None
+
+
+def git_ls_python_files(pathspecs: Sequence[str] = ()) -> list[str] | None:
+    """Return tracked ``.py`` files under ``pathspecs`` via ``git ls-files``.
+
+    Paths are relative to the current directory. Returns ``None`` if git is
+    unavailable or the current directory is not inside a work tree.
+    """
+    try:
+        proc = subprocess.run(  # noqa: S603
+            ["git", "ls-files", "-z", "--", *pathspecs],  # noqa: S607
+            capture_output=True,
+            check=True,
+        )
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    names = os.fsdecode(proc.stdout).split("\0")
+    return [name for name in names if name.endswith(".py")]
+
+
+def write_text_atomic(path: Path, text: str) -> None:
+    """Replace the contents of ``path`` with ``text`` in one step.
+
+    The text is written to a sibling temporary file that then replaces the
+    target, so an interrupted run never leaves a partially written source
+    file. Symlinks are followed and the file's permission bits are kept.
+    """
+    target = Path(os.path.realpath(path))
+    mode = target.stat().st_mode & 0o7777
+    fd, name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.")
+    tmp = Path(name)
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write(text)
+        tmp.chmod(mode)
+        tmp.replace(target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
@@ -5,19 +5,28 @@
 
 from __future__ import annotations
 
+import functools
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
 from typing import TYPE_CHECKING
 
 import libcst as cst
-from libcst.metadata import MetadataWrapper
+from libcst.metadata import MetadataWrapper, PositionProvider
 
-from .transformer import QuoteKeysTransformer
+from .cache import cache_key
+from .textual import rewrite_textual_tokens
+from .transformer import QuoteKeysTransformer, find_noqa_lines
 
 if TYPE_CHECKING:
+    from collections.abc import Iterator, Sequence
+    from concurrent.futures import Future
     from pathlib import Path
 
+    from .cache import ResultCache
 
-@dataclass
+
+@dataclass(slots=True)
 class ProcessResult:
     """Result of processing a single file."""
 
@@ -26,17 +35,187 @@ class ProcessResult:
     code: str
 
 
+@functools.lru_cache(maxsize=512)
 def transform_code(code: str) -> tuple[str, bool]:
     """Transform ``code`` and return ``(new_code, changed)``."""
+    if '"' not in code and "'" not in code:
+        # Without a quote character there is no string literal to rewrite, so
+        # skip parsing altogether.
+        return code, False
+    textual = rewrite_textual_tokens(code)
+    if textual is not None:
+        # No literal can be a key: only the textual rule applies.
+        return textual
+    # The default parser config is a shared module-level instance, and the
+    # native parser does not consult its grammar version, so pinning one with
+    # ``PartialParserConfig`` would not speed anything up.
     module = cst.parse_module(code)
-    wrapper = MetadataWrapper(module)
-    new_module = wrapper.visit(QuoteKeysTransformer(source_code=code))
+    noqa_lines = find_noqa_lines(code)
+    positions = None
+    if noqa_lines and "# noqa: quote-keys" not in code:
+        # Positions are only needed to resolve per-line opt-outs, and a
+        # file-level opt-out already disables every key rewrite. The module is
+        # not reused afterwards, so skip the defensive deep copy.
+        wrapper = MetadataWrapper(module, unsafe_skip_copy=True)
+        positions = wrapper.resolve(PositionProvider)
+    transformer = QuoteKeysTransformer(
+        source_code=code, positions=positions, noqa_lines=noqa_lines
+    )
+    new_module = module.visit(transformer)
+    if not transformer.changed:
+        # Nothing was rewritten: skip generating code for the whole module.
+        return code, False
     new_code = new_module.code
     return new_code, new_code != code
 
 
-def process_file(path: Path) -> ProcessResult:
-    """Read ``path``, transform its contents, and return a ``ProcessResult``."""
+def process_file(path: Path, cache: ResultCache | None = None) -> ProcessResult:
+    """Read ``path``, transform its contents, and return a ``ProcessResult``.
+
+    When ``cache`` is given, a previously recorded result for identical
+    contents is returned without parsing, and new results are recorded.
+    """
     original = path.read_text()
+    if cache is None:
+        new_code, changed = transform_code(original)
+        return ProcessResult(path=path, changed=changed, code=new_code)
+
+    key = cache_key(original)
+    hit = _cached_result(path, original, key, cache)
+    if hit is not None:
+        return hit
     new_code, changed = transform_code(original)
+    cache.put(key, changed, new_code)
     return ProcessResult(path=path, changed=changed, code=new_code)
+
+
+def process_files(
+    paths: Sequence[Path],
+    cache: ResultCache | None = None,
+    jobs: int = 1,
+) -> Iterator[ProcessResult]:
+    """Process ``paths`` and yield their results in order.
+
+    Files are read and looked up in ``cache`` in this process; cache misses
+    are transformed on up to ``jobs`` worker processes. Each result is
+    yielded as soon as it and every result before it are ready, so callers
+    can act on early files while later ones are still being transformed.
+    Paths that do not exist or are directories are skipped.
+    """
+    lookups = _look_up(paths, cache)
+    if jobs <= 1 or len(paths) <= 1:
+        for item in lookups:
+            if isinstance(item, ProcessResult):
+                yield item
+            else:
+                path, original, key = item
+                yield _record(path, key, transform_code(original), cache)
+        return
+    yield from _process_in_pool(lookups, cache, min(jobs, len(paths)))
+
+
+def _look_up(
+    paths: Sequence[Path], cache: ResultCache | None
+) -> Iterator[ProcessResult | tuple[Path, str, str | None]]:
+    """Yield the cached result, or ``(path, source, key)`` to transform."""
+    for path in paths:
+        try:
+            original = path.read_text()
+        except (FileNotFoundError, IsADirectoryError):
+            continue
+        if cache is None:
+            yield path, original, None
+            continue
+        key = cache_key(original)
+        hit = _cached_result(path, original, key, cache)
+        yield (path, original, key) if hit is None else hit
+
+
+def _process_in_pool(
+    lookups: Iterator[ProcessResult | tuple[Path, str, str | None]],
+    cache: ResultCache | None,
+    workers: int,
+) -> Iterator[ProcessResult]:
+    """Transform the cache misses among ``lookups`` on ``workers`` processes.
+
+    Only a few tasks per worker are in flight at once, which bounds the
+    sources held in memory; the pool is started when the first miss turns up.
+    """
+    window = workers * 4
+    pending: deque[ProcessResult | _Task] = deque()
+    executor: ProcessPoolExecutor | None = None
+    try:
+        for item in lookups:
+            if not isinstance(item, ProcessResult):
+                if executor is None:
+                    executor = ProcessPoolExecutor(max_workers=workers)
+                path, original, key = item
+                future = executor.submit(_transform_in_worker, original)
+                item = _Task(path, original, key, future)
+            pending.append(item)
+            while pending and (len(pending) >= window or _is_ready(pending[0])):
+                yield _settle(pending.popleft(), cache)
+        while pending:
+            yield _settle(pending.popleft(), cache)
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+@dataclass(slots=True)
+class _Task:
+    """A cache miss submitted to the worker pool."""
+
+    path: Path
+    original: str
+    key: str | None
+    future: Future[tuple[str | None, bool]]
+
+
+def _is_ready(item: ProcessResult | _Task) -> bool:
+    """Return True if ``item`` can be settled without waiting."""
+    return isinstance(item, ProcessResult) or item.future.done()
+
+
+def _settle(item: ProcessResult | _Task, cache: ResultCache | None) -> ProcessResult:
+    """Return the result for ``item``, waiting for its worker if needed."""
+    if isinstance(item, ProcessResult):
+        return item
+    new_code, changed = item.future.result()
+    code = item.original if new_code is None else new_code
+    return _record(item.path, item.key, (code, changed), cache)
+
+
+def _record(
+    path: Path,
+    key: str | None,
+    outcome: tuple[str, bool],
+    cache: ResultCache | None,
+) -> ProcessResult:
+    """Record a fresh ``(new_code, changed)`` outcome in ``cache`` and wrap it."""
+    new_code, changed = outcome
+    if cache is not None and key is not None:
+        cache.put(key, changed, new_code)
+    return ProcessResult(path=path, changed=changed, code=new_code)
+
+
+def _transform_in_worker(code: str) -> tuple[str | None, bool]:
+    """Run ``transform_code`` in a worker; ``None`` stands for the input.
+
+    Most files come back unchanged, and the parent already holds their
+    source, so only rewritten code is pickled back.
+    """
+    new_code, changed = transform_code(code)
+    return (new_code if changed else None), changed
+
+
+def _cached_result(
+    path: Path, original: str, key: str, cache: ResultCache
+) -> ProcessResult | None:
+    """Return the ``ProcessResult`` recorded for ``key``, if any."""
+    hit = cache.get(key)
+    if hit is None:
+        return None
+    changed, cached_code = hit
+    code = cached_code if changed and cached_code is not None else original
+    return ProcessResult(path=path, changed=changed, code=code)
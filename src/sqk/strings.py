@@ -11,13 +11,23 @@ prefixes, and to quickly detect string literal properties.
 from __future__ import annotations
 
 import ast
-import json
+import codecs
+import functools
 from dataclasses import dataclass
+from typing import TYPE_CHECKING
 
-import libcst as cst
+if TYPE_CHECKING:
+    import libcst as cst
 
+_unicode_escape_decode = codecs.getdecoder("unicode_escape")
+_QUOTES = "'\""
+_TRIPLE = {"'": "'''", '"': '"""'}
+# Prefixes of ``SimpleString`` tokens whose quotes may be changed; raw and
+# bytes prefixes are excluded.
+_CONVERTIBLE_PREFIXES = frozenset({"", "u", "U"})
 
-@dataclass(frozen=True)
+
+@dataclass(frozen=True, slots=True)
 class ParsedStringPrefix:
     """Parsed information about a string literal's prefix (e.g., r, b, u)."""
 
@@ -27,20 +37,26 @@ class ParsedStringPrefix:
     raw_prefix: str
 
 
-def _split_prefix_and_quoting(text: str) -> tuple[str, str]:
-    """Split a literal token into ``(prefix, rest)``.
+def _classify(text: str) -> tuple[int, str, bool]:
+    """Return ``(prefix_len, quote, triple)`` for the literal token ``text``.
 
-    ``text`` must be the raw token from ``cst.SimpleString.value``.
+    ``text`` must be the raw token from ``cst.SimpleString.value``. String
+    prefixes are at most two characters long, so the prefix length follows
+    from where the first quote sits among the first three characters.
     """
-    i = 0
-    while i < len(text) and text[i] not in ("'", '"'):
-        i += 1
-    return text[:i], text[i:]
+    if text[0] in _QUOTES:
+        prefix_len = 0
+    elif text[1] in _QUOTES:
+        prefix_len = 1
+    else:
+        prefix_len = 2
+    quote = text[prefix_len]
+    return prefix_len, quote, text.startswith(_TRIPLE[quote], prefix_len)
 
 
 def parse_prefix(text: str) -> ParsedStringPrefix:
     """Parse and return the prefix details of a literal token ``text``."""
-    prefix, _ = _split_prefix_and_quoting(text)
+    prefix = text[: _classify(text)[0]]
     lower = prefix.lower()
     return ParsedStringPrefix(
         has_raw="r" in lower,
@@ -52,98 +68,169 @@ def parse_prefix(text: str) -> ParsedStringPrefix:
 
 def is_triple_quoted(text: str) -> bool:
     """Return True if the literal is triple-quoted."""
-    _, rest = _split_prefix_and_quoting(text)
-    return rest.startswith(("'''", '"""'))
+    return _classify(text)[2]
 
 
 def is_single_quoted(text: str) -> bool:
     """Return True if the literal uses single quotes (not triple)."""
-    _, rest = _split_prefix_and_quoting(text)
-    return (not is_triple_quoted(text)) and rest.startswith("'")
+    _, quote, triple = _classify(text)
+    return quote == "'" and not triple
 
 
-def to_single_quoted_string(simple: cst.SimpleString) -> cst.SimpleString | None:
-    """Return a new ``SimpleString`` with single quotes, or ``None`` if unchanged.
+def _is_convertible(prefix: str, triple: bool) -> bool:
+    """Return True if the quotes of a literal with ``prefix`` may change."""
+    return not triple and prefix in _CONVERTIBLE_PREFIXES
 
-    Rules:
-    - Skip raw strings (``r"..."``) and byte strings (``b"..."``)
-    - Skip triple-quoted strings
-    - Only transform strings currently using double quotes
-    - Preserve ``u`` prefix if present
-    - Use Python's ``repr`` to produce a canonical single-quoted literal
+
+def _split_literal(text: str) -> tuple[str, str, str] | None:
+    """Return ``(prefix, quote, value)`` of a convertible literal ``text``.
+
+    Returns ``None`` for raw, byte and triple-quoted literals, and for tokens
+    that cannot be decoded.
     """
-    original = simple.value
-    if is_single_quoted(original):
-        return None
-    if is_triple_quoted(original):
-        return None
-    prefix = parse_prefix(original)
-    if prefix.has_raw or prefix.has_bytes:
+    prefix_len, quote, triple = _classify(text)
+    prefix = text[:prefix_len]
+    if not _is_convertible(prefix, triple):
         return None
+    value = _decode_body(text, text[prefix_len + 1 : -1])
+    return None if value is None else (prefix, quote, value)
+
 
+def _decode_body(text: str, body: str) -> str | None:
+    """Decode ``body``, the text between the quotes of literal ``text``."""
+    if "\\" not in body:
+        return body
     try:
-        value = ast.literal_eval(original)
+        # The codec only knows ``\<LF>`` line continuations; ``\<CR><LF>`` and
+        # ``\<CR>`` are left to the compiler.
+        if body.isascii() and "\r" not in body:
+            return _unicode_escape_decode(body.encode("ascii"))[0]
+        value = ast.literal_eval(text)
     except (SyntaxError, ValueError):
         # Be conservative: if we cannot evaluate, do not change.
         return None
+    return value if isinstance(value, str) else None
 
-    # repr() prefers single quotes unless it needs to escape them.
-    new_token = repr(value)
-
-    if prefix.has_unicode and not prefix.raw_prefix:
-        # If original used bare 'u', re-add it (choose lowercase for consistency)
-        new_token = "u" + new_token
-    elif prefix.has_unicode and prefix.raw_prefix:
-        # Preserve exact prefix casing/ordering if any
-        # Replace the quote portion of the original with repr-produced token quotes
-        # by simply prefixing with the original prefix.
-        new_token = prefix.raw_prefix + new_token
-
-    # If there was an original prefix and we didn't preserve it above, but it
-    # didn't include raw/bytes (already excluded), keep it as-is.
-    if prefix.raw_prefix and not (
-        prefix.has_unicode
-        and prefix.raw_prefix
-        and new_token.startswith(prefix.raw_prefix)
-    ):
-        # Avoid duplicating 'u' handled above
-        kept = prefix.raw_prefix
-        if "u" in kept.lower():
-            kept = kept.replace("u", "").replace("U", "")
-        new_token = kept + new_token
-
-    if new_token == original:
-        return None
-    return cst.SimpleString(new_token)
 
+def _escape_table(quote: str) -> dict[int, str]:
+    """Build a ``str.translate`` table escaping ``quote`` and ASCII controls."""
+    table = {code: f"\\x{code:02x}" for code in (*range(0x20), 0x7F)}
+    table.update({ord("\t"): "\\t", ord("\n"): "\\n", ord("\r"): "\\r"})
+    table[ord("\\")] = "\\\\"
+    table[ord(quote)] = "\\" + quote
+    return table
 
-def to_double_quoted_string(simple: cst.SimpleString) -> cst.SimpleString | None:
-    """Return a new ``SimpleString`` using double quotes, or ``None`` if unchanged.
 
-    Skips raw/bytes and triple-quoted strings. Preserves content and prefixes.
+_ESCAPES = {quote: _escape_table(quote) for quote in ("'", '"')}
+
+
+def _requote(value: str, quote: str) -> str:
+    """Return ``value`` as a literal body wrapped in ``quote``.
+
+    Most values need no escaping at all, which three C-level scans confirm
+    far faster than a table-driven ``str.translate``. Otherwise escapes are
+    applied by a single ``translate`` call; only values with non-ASCII
+    non-printable characters take the per-character ``repr`` path.
     """
-    original = simple.value
-    if is_triple_quoted(original):
+    if quote not in value and "\\" not in value and value.isprintable():
+        return quote + value + quote
+    body = value.translate(_ESCAPES[quote])
+    if not body.isprintable():
+        body = "".join(c if c.isprintable() else repr(c)[1:-1] for c in body)
+    return quote + body + quote
+
+
+def _single_quoted(value: str) -> str:
+    """Quote ``value``, preferring single quotes unless it contains one."""
+    # Same choice as repr(): keep double quotes to avoid escaping a quote.
+    if "'" in value and '"' not in value:
+        return _requote(value, '"')
+    return _requote(value, "'")
+
+
+def _double_quoted(value: str) -> str:
+    """Quote ``value`` with double quotes."""
+    return _requote(value, '"')
+
+
+@functools.lru_cache(maxsize=4096)
+def rewrite_preferred_quotes(text: str) -> str | None:
+    r"""Return literal ``text`` in its preferred quote style, or ``None``.
+
+    Rules for non-raw, non-bytes, non-triple-quoted strings:
+    - If value contains a double quote and no single quotes, prefer the
+      single-quoted form: "foo\"bar" -> 'foo"bar'.
+    - Otherwise, prefer the double-quoted form.
+
+    The prefix is scanned and the body decoded once per distinct token;
+    ``None`` means the token is already in its preferred form or must not be
+    touched.
+    """
+    parts = _split_literal(text)
+    if parts is None:
         return None
-    prefix = parse_prefix(original)
-    if prefix.has_raw or prefix.has_bytes:
+    prefix, quote, value = parts
+    if '"' in value and "'" not in value:
+        if quote == "'":
+            return None
+        new_token = prefix + _single_quoted(value)
+    else:
+        if quote == '"':
+            return None
+        new_token = prefix + _double_quoted(value)
+    return None if new_token == text else new_token
+
+
+@functools.lru_cache(maxsize=4096)
+def rewrite_single_quotes(text: str) -> str | None:
+    """Return literal ``text`` single-quoted, or ``None`` if it stays as is.
+
+    Token-level counterpart of ``to_single_quoted_string``. Results are
+    memoized: the same key tokens recur throughout a code base.
+    """
+    # Already-single-quoted tokens are the common no-op; their last character
+    # is the closing quote, so return before decoding anything.
+    if text[-1] == "'":
         return None
-
-    _, rest = _split_prefix_and_quoting(original)
-    if rest.startswith('"') and not rest.startswith('"""'):
+    parts = _split_literal(text)
+    if parts is None:
         return None
+    prefix, _, value = parts
+    new_token = prefix + _single_quoted(value)
+    return None if new_token == text else new_token
 
-    try:
-        value = ast.literal_eval(original)
-    except (SyntaxError, ValueError):
-        return None
 
-    dq = json.dumps(value)
-    if prefix.has_unicode and not prefix.raw_prefix:
-        dq = "u" + dq
-    elif prefix.raw_prefix:
-        dq = prefix.raw_prefix + dq
+def to_single_quoted_string(simple: cst.SimpleString) -> cst.SimpleString | None:
+    """Return ``simple`` with single quotes, or ``None`` if unchanged.
+
+    The result is built with ``with_changes``, so parentheses and other
+    attributes of ``simple`` are kept. Rules:
+    - Skip raw strings (``r"..."``) and byte strings (``b"..."``)
+    - Skip triple-quoted strings
+    - Only transform strings currently using double quotes
+    - Preserve the ``u`` prefix if present
+    - Keep double quotes if the value contains a single quote
+    """
+    new_token = rewrite_single_quotes(simple.value)
+    return None if new_token is None else simple.with_changes(value=new_token)
+
 
+def to_double_quoted_string(simple: cst.SimpleString) -> cst.SimpleString | None:
+    """Return ``simple`` using double quotes, or ``None`` if unchanged.
+
+    Skips raw/bytes and triple-quoted strings. Preserves content, prefixes
+    and the node's parentheses.
+    """
+    original = simple.value
+    # Already-double-quoted tokens end with their closing quote; return
+    # before decoding anything.
+    if original[-1] == '"':
+        return None
+    parts = _split_literal(original)
+    if parts is None:
+        return None
+    prefix, _, value = parts
+    dq = prefix + _double_quoted(value)
     if dq == original:
         return None
-    return cst.SimpleString(dq)
+    return simple.with_changes(value=dq)
@@ -0,0 +1,139 @@
+# Copyright (c) 2025 kynguyen and contributors. All rights reserved.
+# Licensed under the MIT license. See LICENSE file in the project root for details.
+
+"""Token-level fast path for sources where only textual quoting applies.
+
+When a module has no key-taking call names and no string literal in a
+position that could be a dict or subscript key, the transformer would only
+apply ``strings.rewrite_preferred_quotes`` to each literal. That rewrite is
+done here on ``tokenize`` tokens and spliced into the source, which is much
+cheaper than building and serializing a libcst tree.
+"""
+
+from __future__ import annotations
+
+import ast
+import io
+import keyword
+import token
+import tokenize
+from typing import TYPE_CHECKING
+
+from .strings import rewrite_preferred_quotes
+from .transformer import QuoteKeysTransformer
+
+if TYPE_CHECKING:
+    from collections.abc import Iterable
+
+_FSTRING_STARTS = frozenset(
+    filter(None, (token.FSTRING_START, getattr(token, "TSTRING_START", None)))
+)
+_FSTRING_ENDS = frozenset(
+    filter(None, (token.FSTRING_END, getattr(token, "TSTRING_END", None)))
+)
+# Tokens after which ``[`` starts a new statement rather than a subscript.
+_STATEMENT_STARTS = frozenset({
+    token.NEWLINE,
+    token.INDENT,
+    token.DEDENT,
+    token.ENCODING,
+})
+# Tokens ignored when looking at what precedes a ``[``.
+_TRIVIA = frozenset({token.NL, token.COMMENT})
+
+# ``(start, end, new_token)`` with ``tokenize`` (row, column) positions.
+_Edit = tuple[tuple[int, int], tuple[int, int], str]
+
+
+def rewrite_textual_tokens(code: str) -> tuple[str, bool] | None:
+    """Return ``(new_code, changed)`` for ``code``, or ``None`` if unsure.
+
+    ``None`` means a literal may be a key, or the source does not compile;
+    callers then run the full libcst transform.
+    """
+    if "\r" in code or QuoteKeysTransformer.may_have_key_calls(code):
+        return None
+    try:
+        # Tokens are consumed as they are produced, so a file with a possible
+        # key is handed to libcst without tokenizing the rest of it; only
+        # files that stay on this path pay for the syntax check.
+        edits = _collect_edits(tokenize.generate_tokens(io.StringIO(code).readline))
+        if edits is None:
+            return None
+        compile(code, "<sqk>", "exec", ast.PyCF_ONLY_AST, dont_inherit=True)
+    except (SyntaxError, ValueError, tokenize.TokenError):
+        return None
+
+    if not edits:
+        return code, False
+    return _splice(code, edits), True
+
+
+def _collect_edits(tokens: Iterable[tokenize.TokenInfo]) -> list[_Edit] | None:
+    """Return the literal rewrites for ``tokens``, or ``None`` if one may be a key."""
+    edits: list[_Edit] = []
+    # One entry per open bracket: whether a literal directly inside it could
+    # be a key. Parentheses inherit from their parent, so ``d[("a")]`` counts.
+    keyed: list[bool] = []
+    fstring_depth = 0
+    prev: tokenize.TokenInfo | None = None
+    for tok in tokens:
+        kind = tok.type
+        if kind == token.OP:
+            _track_bracket(keyed, tok.string, prev)
+        elif kind in _FSTRING_STARTS:
+            fstring_depth += 1
+        elif kind in _FSTRING_ENDS:
+            fstring_depth -= 1
+        elif kind == token.STRING and not fstring_depth:
+            # Literals in f-string replacement fields are left alone, as in
+            # the transformer.
+            if keyed and keyed[-1]:
+                return None
+            new_token = rewrite_preferred_quotes(tok.string)
+            if new_token is not None:
+                edits.append((tok.start, tok.end, new_token))
+        if kind not in _TRIVIA:
+            prev = tok
+    return edits
+
+
+def _track_bracket(
+    keyed: list[bool], text: str, prev: tokenize.TokenInfo | None
+) -> None:
+    """Update the open-bracket stack ``keyed`` for operator ``text``."""
+    if text == "(":
+        keyed.append(bool(keyed) and keyed[-1])
+    elif text == "{":
+        keyed.append(True)
+    elif text == "[":
+        keyed.append(_starts_subscript(prev))
+    elif text in ")]}" and keyed:
+        # Unbalanced closers are left for ``compile`` to reject.
+        keyed.pop()
+
+
+def _starts_subscript(prev: tokenize.TokenInfo | None) -> bool:
+    """Return True unless ``[`` after ``prev`` is certainly a list display."""
+    if prev is None or prev.type in _STATEMENT_STARTS:
+        return False
+    if prev.type == token.OP:
+        return prev.string in ")]}"
+    return not (prev.type == token.NAME and keyword.iskeyword(prev.string))
+
+
+def _splice(code: str, edits: list[_Edit]) -> str:
+    """Replace the ``(start, end)`` token ranges of ``edits`` in ``code``."""
+    line_starts = [0, 0]
+    pos = code.find("\n")
+    while pos != -1:
+        line_starts.append(pos + 1)
+        pos = code.find("\n", pos + 1)
+    parts: list[str] = []
+    last = 0
+    for (start_row, start_col), (end_row, end_col), new_token in edits:
+        start = line_starts[start_row] + start_col
+        parts.extend((code[last:start], new_token))
+        last = line_starts[end_row] + end_col
+    parts.append(code[last:])
+    return "".join(parts)
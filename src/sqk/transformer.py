@@ -20,14 +20,14 @@ Rules:
 
 from __future__ import annotations
 
-import ast
+import re
+from typing import TYPE_CHECKING, Any, ClassVar
 
 import libcst as cst
-from libcst import matchers as m
-from libcst.metadata import PositionProvider
 
 from .constants import (
     ATTR_FUNCS,
+    DICT_CONSTRUCTORS,
     DUUNDER_ATTR,
     DUUNDER_KEY,
     FROM_KEYS,
@@ -35,267 +35,312 @@ from .constants import (
     NOQA_TAG,
     OPERATOR_GETTERS,
 )
-from .strings import to_double_quoted_string, to_single_quoted_string
+from .strings import rewrite_preferred_quotes, rewrite_single_quotes
+
+if TYPE_CHECKING:
+    from collections.abc import Callable, Iterable, Mapping
+
+    from libcst.metadata import CodeRange
+
+_DICT_CONSTRUCTOR_NAMES = frozenset(
+    name.rpartition(".")[2] for name in DICT_CONSTRUCTORS
+)
+# A noqa comment whose code list includes the tag, in any of the spellings
+# linters accept: ``noqa: quote-keys``, ``NOQA:quote-keys``, ``noqa: E501,
+# quote-keys`` and so on.
+_NOQA_RE = re.compile(rf"#\s*(?i:noqa)\s*:[^\r\n]*\b{re.escape(NOQA_TAG)}\b")
+
+
+def find_noqa_lines(source_code: str) -> frozenset[int]:
+    """Return the 1-based numbers of the lines with a quote-keys noqa comment."""
+    if NOQA_TAG not in source_code:
+        return frozenset()
+    lines: set[int] = set()
+    # Like libcst positions, count ``\r\n``, ``\r`` and ``\n`` as line breaks.
+    has_cr = "\r" in source_code
+    line, pos = 1, 0
+    for match in _NOQA_RE.finditer(source_code):
+        start = match.start()
+        line += source_code.count("\n", pos, start)
+        if has_cr:
+            line += source_code.count("\r", pos, start)
+            line -= source_code.count("\r\n", pos, start)
+        pos = start
+        lines.add(line)
+    return frozenset(lines)
 
 
 class QuoteKeysTransformer(cst.CSTTransformer):
-    """Transform qualifying string literals used as keys to single quotes."""
+    """Transform qualifying string literals used as keys to single quotes.
 
-    METADATA_DEPENDENCIES = (PositionProvider,)
+    Keys are collected top-down by the ``visit_*`` methods while the original
+    nodes are visited, and every literal is rewritten exactly once in
+    ``leave_SimpleString``: keys get single quotes, other literals the
+    preferred textual quotes.
 
-    def __init__(self, source_code: str) -> None:
-        self._lines = source_code.splitlines()
+    ``positions`` maps nodes of the parsed module to their source ranges and is
+    only needed to honour per-line opt-outs; callers may omit it when
+    ``source_code`` contains no noqa tag. Callers that already ran
+    ``find_noqa_lines`` on ``source_code`` can pass the result as
+    ``noqa_lines`` to avoid scanning the source twice.
+
+    After visiting, ``changed`` tells whether any literal ended up different
+    from the source, so callers can skip generating code for untouched
+    modules.
+    """
+
+    # libcst's base classes keep an instance ``__dict__``; the slots still make
+    # the per-node attribute reads descriptor lookups instead of dict probes.
+    __slots__ = (
+        "_changes",
+        "_keys",
+        "_noqa_lines",
+        "_positions",
+        "_scan_calls",
+        "_source_has_noqa",
+    )
+
+    def __init__(
+        self,
+        source_code: str,
+        positions: Mapping[cst.CSTNode, CodeRange] | None = None,
+        noqa_lines: frozenset[int] | None = None,
+    ) -> None:
+        super().__init__()
+        # Number of literals rewritten to a token different from the source.
+        self._changes = 0
+        # Original key literals that should be single-quoted.
+        self._keys: set[cst.SimpleString] = set()
         self._source_has_noqa = "# noqa: quote-keys" in source_code
+        self._scan_calls = self.may_have_key_calls(source_code)
+        self._positions = positions
+        # 1-based numbers of the lines carrying a noqa comment, computed once.
+        if noqa_lines is None:
+            noqa_lines = find_noqa_lines(source_code)
+        self._noqa_lines = noqa_lines
+
+    @classmethod
+    def may_have_key_calls(cls, source_code: str) -> bool:
+        """Return True if ``source_code`` mentions a call name with a key rule."""
+        return cls._CALL_TRIGGER_RE.search(source_code) is not None
+
+    @property
+    def changed(self) -> bool:
+        """Whether the visited module differs from its source."""
+        return self._changes > 0
 
     def _has_noqa_comment(self, node: cst.CSTNode) -> bool:
-        """Return True if the node's line contains the noqa tag."""
-        try:
-            code_range = self.get_metadata(PositionProvider, node)
-        except KeyError:
+        """Return True if the node's line has a quote-keys noqa comment."""
+        if self._positions is None:
             return False
-        line_no = max(1, min(len(self._lines), code_range.end.line))
-        line_text = self._lines[line_no - 1]
-        return NOQA_TAG in line_text
-
-    def _maybe_requote(
-        self, node: cst.CSTNode, s: cst.BaseExpression
-    ) -> cst.BaseExpression:
-        if (
-            self._source_has_noqa
-            or self._has_noqa_comment(node)
-            or self._has_noqa_comment(s)
-        ):
-            return s
-        if isinstance(s, cst.SimpleString):
-            new_s = to_single_quoted_string(s)
-            return new_s or s
-        return s
-
-    def leave_Call(  # noqa: N802, C901
-        self, _original_node: cst.Call, updated_node: cst.Call
-    ) -> cst.BaseExpression:
-        """Rewrite arguments to calls that treat the first string as a key."""
-        func_name = None
-        if m.matches(updated_node.func, m.Name() | m.Attribute()):
-            # Extract dotted name best-effort
-            parts: list[str] = []
-            cur = updated_node.func
-            while isinstance(cur, cst.Attribute):
-                if isinstance(cur.attr, cst.Name):
-                    parts.append(cur.attr.value)
-                cur = cur.value
-            if isinstance(cur, cst.Name):
-                parts.append(cur.value)
-            func_name = ".".join(reversed(parts))
-
-        # builtins getattr/hasattr/setattr/delattr
-        if (
-            func_name
-            and func_name.split(".")[-1] in ATTR_FUNCS
-            and len(updated_node.args) >= 2
-        ):
-            key_arg = updated_node.args[1]
-            new_value = self._maybe_requote(updated_node, key_arg.value)
-            updated_args = list(updated_node.args)
-            updated_args[1] = key_arg.with_changes(value=new_value)
-            return updated_node.with_changes(args=tuple(updated_args))
-
-        # mapping methods first arg: get/pop/setdefault
-        if isinstance(updated_node.func, cst.Attribute) and isinstance(
-            updated_node.func.attr, cst.Name
-        ):
-            meth = updated_node.func.attr.value
-            if meth in MAPPING_FIRST_KEY_METHODS and updated_node.args:
-                arg0 = updated_node.args[0]
-                new_value = self._maybe_requote(updated_node, arg0.value)
-                updated_args = list(updated_node.args)
-                updated_args[0] = arg0.with_changes(value=new_value)
-                return updated_node.with_changes(args=tuple(updated_args))
-
-        # operator getters: attrgetter/itemgetter/methodcaller
-        if (
-            func_name
-            and func_name.split(".")[-1] in OPERATOR_GETTERS
-            and updated_node.args
-        ):
-            arg0 = updated_node.args[0]
-            new_value = self._maybe_requote(updated_node, arg0.value)
-            updated_args = list(updated_node.args)
-            updated_args[0] = arg0.with_changes(value=new_value)
-            return updated_node.with_changes(args=tuple(updated_args))
-
-        # dict/OrderedDict constructors from pairs: dict([...])
-        if (
-            func_name
-            and func_name.split(".")[-1] in {"dict", "OrderedDict"}
-            and updated_node.args
-        ):
-            # Handle dict([("a", 1), ("b", 2)]) or dict({"a": 1})
-            first = updated_node.args[0].value
-            if isinstance(first, cst.Dict):
-                new_elements = []
-                for elt in first.elements or ():
-                    if isinstance(elt, cst.DictElement) and elt.key is not None:
-                        new_key = self._maybe_requote(first, elt.key)
-                        new_elements.append(elt.with_changes(key=new_key))
-                    else:
-                        new_elements.append(elt)
-                return updated_node.deep_replace(
-                    first, first.with_changes(elements=new_elements)
-                )
-            if isinstance(first, (cst.List, cst.Tuple)):
-                new_elts = []
-                for elt in first.elements or ():
-                    value = elt.value if isinstance(elt, cst.Element) else elt
-                    if isinstance(value, (cst.Tuple, cst.List)) and value.elements:
-                        # pair like (key, val)
-                        pair_elts = list(value.elements)
-                        if pair_elts:
-                            pair0 = pair_elts[0]
-                            new0_val = self._maybe_requote(value, pair0.value)
-                            pair_elts[0] = pair0.with_changes(value=new0_val)
-                            new_pair = value.with_changes(elements=tuple(pair_elts))
-                            if isinstance(elt, cst.Element):
-                                new_elts.append(elt.with_changes(value=new_pair))
-                            else:
-                                new_elts.append(new_pair)
-                            continue
-                    new_elts.append(elt)
-                return updated_node.deep_replace(
-                    first, first.with_changes(elements=new_elts)
-                )
-
-        # Handle fromkeys() with sequences of keys
-        if (
-            isinstance(updated_node.func, cst.Attribute)
-            and isinstance(updated_node.func.attr, cst.Name)
-            and updated_node.func.attr.value in FROM_KEYS
-            and updated_node.args
-        ):
-            arg0 = updated_node.args[0]
-            target = arg0.value
-            if isinstance(target, (cst.List, cst.Tuple, cst.Set)):
-                new_elts = []
-                for elt in target.elements or ():
-                    if isinstance(elt, cst.Element):
-                        new_elts.append(
-                            elt.with_changes(
-                                value=self._maybe_requote(target, elt.value)
-                            )
-                        )
-                    else:
-                        new_elts.append(self._maybe_requote(target, elt))
-                new_target = target.with_changes(elements=tuple(new_elts))
-                new_args = list(updated_node.args)
-                new_args[0] = arg0.with_changes(value=new_target)
-                return updated_node.with_changes(args=tuple(new_args))
-
-        # dunder key/attr methods when invoked as calls, e.g., obj.__getitem__("key")
-        if isinstance(updated_node.func, cst.Attribute) and isinstance(
-            updated_node.func.attr, cst.Name
+        code_range = self._positions.get(node)
+        return code_range is not None and code_range.end.line in self._noqa_lines
+
+    def _add_keys(self, owner: cst.CSTNode, keys: Iterable[cst.CSTNode]) -> None:
+        """Mark the ``SimpleString`` nodes among ``keys`` of ``owner`` as keys.
+
+        Nothing is marked when the file or ``owner``'s line opts out; a key on
+        an opted-out line of its own is skipped individually.
+        """
+        if self._source_has_noqa or (
+            self._noqa_lines and self._has_noqa_comment(owner)
         ):
-            dunder = updated_node.func.attr.value
-            if dunder in DUUNDER_KEY and updated_node.args:
-                arg0 = updated_node.args[0]
-                new_value = self._maybe_requote(updated_node, arg0.value)
-                updated_args = list(updated_node.args)
-                updated_args[0] = arg0.with_changes(value=new_value)
-                return updated_node.with_changes(args=tuple(updated_args))
-            if dunder in DUUNDER_ATTR and updated_node.args:
-                # The attribute name is the first string among the first two args
-                idx = None
-                upto = min(2, len(updated_node.args))
-                for i in range(upto):
-                    if isinstance(updated_node.args[i].value, cst.SimpleString):
-                        idx = i
-                        break
-                if idx is not None:
-                    target_arg = updated_node.args[idx]
-                    new_value = self._maybe_requote(updated_node, target_arg.value)
-                    updated_args = list(updated_node.args)
-                    updated_args[idx] = target_arg.with_changes(value=new_value)
-                    return updated_node.with_changes(args=tuple(updated_args))
-
-        return updated_node
-
-    def leave_Dict(  # noqa: N802
-        self, _original_node: cst.Dict, updated_node: cst.Dict
-    ) -> cst.Dict:
-        """Rewrite dict literal keys to single-quoted form where applicable."""
-        new_elements = []
-        changed = False
-        for elt in updated_node.elements or ():
-            if isinstance(elt, cst.DictElement) and elt.key is not None:
-                new_key = self._maybe_requote(updated_node, elt.key)
-                if new_key is not elt.key:
-                    changed = True
-                    new_elements.append(elt.with_changes(key=new_key))
-                else:
-                    new_elements.append(elt)
-            else:
-                new_elements.append(elt)
-        return (
-            updated_node.with_changes(elements=new_elements)
-            if changed
-            else updated_node
+            return
+        for key in keys:
+            if isinstance(key, cst.SimpleString) and not (
+                self._noqa_lines and self._has_noqa_comment(key)
+            ):
+                self._keys.add(key)
+
+    def visit_Call(self, node: cst.Call) -> bool:  # noqa: N802
+        """Collect arguments of calls that treat a string as a key.
+
+        The rule is looked up in ``_CALL_RULES`` by the final name of the
+        called function.
+        """
+        if not self._scan_calls or not node.args:
+            return True
+        func = node.func
+        if isinstance(func, cst.Attribute):
+            rule = self._CALL_RULES.get(func.attr.value)
+        elif isinstance(func, cst.Name):
+            rule = self._CALL_RULES.get(func.value)
+            if rule is not None and rule[1]:
+                return True
+        else:
+            return True
+        if rule is not None:
+            rule[0](self, node)
+        return True
+
+    def _add_arg_key(self, node: cst.Call, index: int) -> None:
+        """Collect the positional argument at ``index``."""
+        if index < len(node.args):
+            self._add_keys(node, (node.args[index].value,))
+
+    def _add_first_arg_key(self, node: cst.Call) -> None:
+        """Collect the first argument, e.g. ``d.get("key")``."""
+        self._add_arg_key(node, 0)
+
+    def _add_second_arg_key(self, node: cst.Call) -> None:
+        """Collect the second argument, e.g. ``getattr(obj, "key")``."""
+        self._add_arg_key(node, 1)
+
+    def _add_dict_constructor_keys(self, node: cst.Call) -> None:
+        """Collect keys of ``dict({...})`` and ``dict([(key, value), ...])``."""
+        first = node.args[0].value
+        if isinstance(first, cst.Dict):
+            self._add_keys(
+                node,
+                (elt.key for elt in first.elements if isinstance(elt, cst.DictElement)),
+            )
+        elif isinstance(first, (cst.List, cst.Tuple)):
+            # pairs like (key, val)
+            pairs = (
+                elt.value if isinstance(elt, cst.Element) else elt
+                for elt in first.elements
+            )
+            self._add_keys(
+                node,
+                (
+                    pair.elements[0].value
+                    for pair in pairs
+                    if isinstance(pair, (cst.Tuple, cst.List)) and pair.elements
+                ),
+            )
+
+    def _add_fromkeys_keys(self, node: cst.Call) -> None:
+        """Collect every key in the sequence passed to ``fromkeys()``."""
+        target = node.args[0].value
+        if isinstance(target, (cst.List, cst.Tuple, cst.Set)):
+            self._add_keys(
+                node,
+                (elt.value for elt in target.elements if isinstance(elt, cst.Element)),
+            )
+
+    def _add_dunder_attr_key(self, node: cst.Call) -> None:
+        """Collect the attribute name of ``obj.__getattr__("key")`` and friends."""
+        # The attribute name is the first string among the first two args
+        for arg in node.args[:2]:
+            if isinstance(arg.value, cst.SimpleString):
+                self._add_keys(node, (arg.value,))
+                return
+
+    def visit_Dict(self, node: cst.Dict) -> bool:  # noqa: N802
+        """Collect dict literal keys."""
+        self._add_keys(
+            node,
+            (elt.key for elt in node.elements if isinstance(elt, cst.DictElement)),
         )
+        return True
 
-    def leave_Subscript(  # noqa: N802
-        self, _original_node: cst.Subscript, updated_node: cst.Subscript
-    ) -> cst.Subscript:
-        """Rewrite subscript keys like obj["a"] -> obj['a']."""
-        # obj["key"] -> obj['key']
-        current = updated_node.slice
-        if current is None:
-            return updated_node
-        elements = current if isinstance(current, tuple) else (current,)
-        new_elems: list[cst.SubscriptElement] = []
-        changed = False
-        for s in elements:
-            if isinstance(s, cst.SubscriptElement) and isinstance(s.slice, cst.Index):
-                target = s.slice.value
-                new_target = self._maybe_requote(updated_node, target)
-                if new_target is not target:
-                    changed = True
-                    new_elems.append(s.with_changes(slice=cst.Index(value=new_target)))
-                else:
-                    new_elems.append(s)
-            else:
-                new_elems.append(s)
-        if not changed:
-            return updated_node
-        new_slice = tuple(new_elems) if isinstance(current, tuple) else new_elems[0]
-        return updated_node.with_changes(slice=new_slice)
+    def visit_Subscript(self, node: cst.Subscript) -> bool:  # noqa: N802
+        """Collect subscript keys like obj["a"]."""
+        # Most subscripts (``a[i]``, ``df[col]``) have no literal key; filter
+        # first so they skip the noqa lookups in ``_add_keys``.
+        keys = [
+            s.slice.value
+            for s in node.slice
+            if isinstance(s.slice, cst.Index)
+            and isinstance(s.slice.value, cst.SimpleString)
+        ]
+        if keys:
+            self._add_keys(node, keys)
+        return True
+
+    def visit_FormattedString(self, node: cst.FormattedString) -> bool:  # noqa: ARG002, N802
+        """Skip f-strings entirely.
 
-    # Dunder methods in class/function defs are covered via Call/Subscript; no special casing for FunctionDef needed.
-    # Additionally, prefer double quotes for standalone textual strings outside key contexts.
+        Literals in replacement fields share the f-string's quotes; requoting
+        them could end the f-string early on Python < 3.12.
+        """
+        return False
+
+    def _prune(self, _node: cst.CSTNode) -> bool:
+        """Skip the children of trivia nodes; they never contain literals."""
+        return False
 
     def leave_SimpleString(  # noqa: N802
-        self, _original_node: cst.SimpleString, updated_node: cst.SimpleString
+        self, original_node: cst.SimpleString, updated_node: cst.SimpleString
     ) -> cst.SimpleString:
-        r"""Prefer quote style that minimizes escaping for textual strings.
-
-        Rules for non-raw, non-bytes, non-triple-quoted strings:
-        - If value contains an unescaped double quote and no single quotes,
-          prefer single-quoted form: "foo\"bar" -> 'foo"bar'.
-        - If value contains a single quote and no double quotes,
-          prefer double-quoted form: 'foo\'bar' -> "foo'bar".
-        - Otherwise, prefer double-quoted form.
+        """Rewrite a literal once, as a key or as textual content.
+
+        Textual strings get the quote style that minimizes escaping (see
+        ``strings.rewrite_preferred_quotes``); keys are then single-quoted
+        unless that would need an escape.
         """
         token = updated_node.value
-        try:
-            value = ast.literal_eval(token)
-        except (SyntaxError, ValueError):
-            # Fall back to previous behavior
-            new_node = to_double_quoted_string(updated_node)
-            return new_node or updated_node
-
-        has_single = "'" in value
-        has_double = '"' in value
-
-        if has_double and not has_single:
-            preferred = to_single_quoted_string(updated_node)
-            return preferred or updated_node
-
-        preferred = to_double_quoted_string(updated_node)
-        return preferred or updated_node
+        new_token = rewrite_preferred_quotes(token) or token
+        if original_node in self._keys:
+            new_token = rewrite_single_quotes(new_token) or new_token
+        if new_token == token:
+            return updated_node
+        self._changes += 1
+        return updated_node.with_changes(value=new_token)
+
+    # Call rules keyed by the final name of the called function. Each value is
+    # ``(handler, method_only)``; method-only rules apply to ``obj.name(...)`` but
+    # not to a bare ``name(...)``.
+    _CALL_RULES: ClassVar[dict[str, tuple[Callable[[Any, cst.Call], None], bool]]] = {
+        **dict.fromkeys(ATTR_FUNCS, (_add_second_arg_key, False)),
+        **dict.fromkeys(OPERATOR_GETTERS, (_add_first_arg_key, False)),
+        **dict.fromkeys(
+            _DICT_CONSTRUCTOR_NAMES,
+            (_add_dict_constructor_keys, False),
+        ),
+        **dict.fromkeys(
+            MAPPING_FIRST_KEY_METHODS | DUUNDER_KEY,
+            (_add_first_arg_key, True),
+        ),
+        **dict.fromkeys(FROM_KEYS, (_add_fromkeys_keys, True)),
+        **dict.fromkeys(DUUNDER_ATTR, (_add_dunder_attr_key, True)),
+    }
+    # Sources without a match cannot contain a key-taking call, so call-site
+    # analysis is skipped.
+    _CALL_TRIGGER_RE: ClassVar[re.Pattern[str]] = re.compile(
+        r"\b(?:{})\b".format("|".join(sorted(_CALL_RULES)))
+    )
+
+    # libcst resolves ``visit_<Type>``/``leave_<Type>`` with a formatted
+    # ``getattr`` for every node, plus one per child attribute. Dispatch on
+    # the node type through these tables instead.
+    _VISITORS: ClassVar[dict[type[cst.CSTNode], Callable[[Any, Any], bool]]] = {
+        cst.Call: visit_Call,
+        cst.Dict: visit_Dict,
+        cst.Subscript: visit_Subscript,
+        cst.FormattedString: visit_FormattedString,
+        **dict.fromkeys(
+            (
+                cst.Comment,
+                cst.EmptyLine,
+                cst.Newline,
+                cst.ParenthesizedWhitespace,
+                cst.SimpleWhitespace,
+                cst.TrailingWhitespace,
+            ),
+            _prune,
+        ),
+    }
+    _LEAVERS: ClassVar[dict[type[cst.CSTNode], Callable[[Any, Any, Any], Any]]] = {
+        cst.SimpleString: leave_SimpleString,
+    }
+
+    def on_visit(self, node: cst.CSTNode) -> bool:
+        """Call the visitor registered for ``type(node)``, if any."""
+        visitor = self._VISITORS.get(type(node))
+        return True if visitor is None else visitor(self, node)
+
+    def on_leave(
+        self, original_node: cst.CSTNode, updated_node: cst.CSTNode
+    ) -> cst.CSTNode:
+        """Call the leave handler registered for ``type(original_node)``, if any."""
+        leaver = self._LEAVERS.get(type(original_node))
+        if leaver is None:
+            return updated_node
+        return leaver(self, original_node, updated_node)
+
+    def on_visit_attribute(self, node: cst.CSTNode, attribute: str) -> None:
+        """No per-attribute visitors are defined."""
+
+    def on_leave_attribute(self, original_node: cst.CSTNode, attribute: str) -> None:
+        """No per-attribute leave handlers are defined."""
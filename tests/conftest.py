@@ -41,6 +41,7 @@ def run_cli(
 
     def _run(args: list[str]) -> int:
         monkeypatch.chdir(tmp_path)
+        monkeypatch.setenv("SQK_CACHE_DIR", str(tmp_path / ".sqk-cache"))
         return cli_main(args)
 
     return _run
@@ -0,0 +1,96 @@
+from __future__ import annotations
+
+# Copyright (c) 2025 kynguyen and contributors. All rights reserved.
+# Licensed under the MIT license. See LICENSE file in the project root for details.
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from sqk import cache as cache_module
+from sqk.cache import ResultCache, cache_key, default_cache_dir
+from sqk.processor import process_file
+
+if TYPE_CHECKING:
+    import pytest
+
+
+def test_cache_round_trip(tmp_path: Path) -> None:
+    cache = ResultCache.load(tmp_path)
+    cache.put("changed", True, "new")
+    cache.put("same", False, "ignored")
+    cache.save()
+
+    reloaded = ResultCache.load(tmp_path)
+    assert reloaded.get("changed") == (True, "new")
+    assert reloaded.get("same") == (False, None)
+    assert reloaded.get("missing") is None
+
+
+def test_cache_hits_alone_persist_recency(tmp_path: Path) -> None:
+    cache = ResultCache.load(tmp_path)
+    cache.put("a", False, None)
+    cache.put("b", False, None)
+    cache.save()
+
+    cache = ResultCache.load(tmp_path)
+    assert cache.get("a") == (False, None)
+    cache.save()
+    assert list(ResultCache.load(tmp_path).entries) == ["b", "a"]
+
+
+def test_save_keeps_entries_used_this_run(
+    tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setattr(cache_module, "CACHE_MAX_ENTRIES", 2)
+    cache = ResultCache.load(tmp_path)
+    for key in ("a", "b", "c"):
+        cache.put(key, False, None)
+    cache.save()
+    assert list(ResultCache.load(tmp_path).entries) == ["a", "b", "c"]
+
+    cache = ResultCache.load(tmp_path)
+    cache.put("d", False, None)
+    cache.save()
+    assert list(ResultCache.load(tmp_path).entries) == ["c", "d"]
+
+
+def test_default_cache_dir_without_home(monkeypatch: pytest.MonkeyPatch) -> None:
+    def no_home() -> Path:
+        raise RuntimeError
+
+    monkeypatch.delenv("SQK_CACHE_DIR", raising=False)
+    monkeypatch.delenv("XDG_CACHE_HOME", raising=False)
+    monkeypatch.setattr(Path, "home", no_home)
+    assert default_cache_dir() is None
+
+
+def test_cache_key_depends_only_on_source() -> None:
+    assert cache_key("x = 1\n") == cache_key("x = 1\n")
+    assert cache_key("x = 1\n") != cache_key("x = 2\n")
+    # Lone surrogates from undecodable files must not break key computation.
+    assert cache_key("\udcff") != cache_key("")
+
+
+def test_corrupt_cache_file_is_ignored(tmp_path: Path) -> None:
+    (tmp_path / "results.json").write_text("not json")
+    assert ResultCache.load(tmp_path).entries == {}
+
+
+def test_process_file_uses_cached_result(tmp_path: Path, write_file) -> None:  # type: ignore[no-untyped-def]
+    src = 'hasattr(obj, "key")\n'
+    file_path = write_file("a.py", src)
+    cache = ResultCache.load(tmp_path / "cache")
+    cache.put(cache_key(src), True, "cached\n")
+
+    result = process_file(file_path, cache)
+    assert result.changed is True
+    assert result.code == "cached\n"
+
+
+def test_process_file_records_result(tmp_path: Path, write_file) -> None:  # type: ignore[no-untyped-def]
+    src = 'hasattr(obj, "key")\n'
+    file_path = write_file("a.py", src)
+    cache = ResultCache.load(tmp_path / "cache")
+
+    result = process_file(file_path, cache)
+    assert result.code == "hasattr(obj, 'key')\n"
+    assert cache.get(cache_key(src)) == (True, "hasattr(obj, 'key')\n")
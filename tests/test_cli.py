@@ -2,8 +2,12 @@ from __future__ import annotations
 
 # Copyright (c) 2025 kynguyen and contributors. All rights reserved.
 # Licensed under the MIT license. See LICENSE file in the project root for details.
+import shutil
+import subprocess
 from typing import TYPE_CHECKING
 
+import pytest
+
 if TYPE_CHECKING:
     from pathlib import Path
 
@@ -36,3 +40,57 @@ exclude = ["a.py"]
     rc = run_cli(["--fix", str(file_path)])
     assert rc == 0
     assert file_path.read_text() == src
+
+
+def test_cli_skips_missing_and_non_python_files(run_cli, write_file) -> None:  # type: ignore[no-untyped-def]
+    write_file("notes.txt", 'hasattr(obj, "key")\n')
+    rc = run_cli(["--fix", "missing.py", "notes.txt"])
+    assert rc == 0
+
+
+@pytest.mark.skipif(shutil.which("git") is None, reason="git is not installed")
+def test_cli_discovers_files_with_git(
+    run_cli, write_file, tmp_path: Path, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    tracked = write_file("pkg/tracked.py", 'hasattr(obj, "key")\n')
+    untracked = write_file("pkg/untracked.py", 'hasattr(obj, "key")\n')
+    subprocess.run(["git", "init", "-q", str(tmp_path)], check=True)
+    subprocess.run(["git", "-C", str(tmp_path), "add", "pkg/tracked.py"], check=True)
+    monkeypatch.setenv("SQK_USE_GIT_LS_FILES", "1")
+
+    rc = run_cli(["--fix", "pkg"])
+    assert rc == 1
+    assert tracked.read_text() == "hasattr(obj, 'key')\n"
+    assert untracked.read_text() == 'hasattr(obj, "key")\n'
+
+
+def test_cli_fix_with_worker_processes(run_cli, write_file) -> None:  # type: ignore[no-untyped-def]
+    files = [write_file(f"m{i}.py", 'd.get("a")\n') for i in range(4)]
+    files.append(write_file("same.py", "d.get('a')\n"))
+    rc = run_cli(["--fix", "--jobs", "2", *map(str, files)])
+    assert rc == 1
+    assert all(f.read_text() == "d.get('a')\n" for f in files)
+
+
+def test_cli_fix_keeps_mode_and_symlinks(run_cli, write_file, tmp_path: Path) -> None:  # type: ignore[no-untyped-def]
+    target = write_file("real.py", 'hasattr(obj, "key")\n')
+    target.chmod(0o751)
+    link = tmp_path / "link.py"
+    link.symlink_to(target)
+    rc = run_cli(["--fix", str(link)])
+    assert rc == 1
+    assert link.is_symlink()
+    assert target.read_text() == "hasattr(obj, 'key')\n"
+    assert target.stat().st_mode & 0o777 == 0o751
+    assert not list(tmp_path.glob(".real.py.*"))
+
+
+@pytest.mark.parametrize("jobs", ["1", "4"])
+def test_cli_fix_writes_files_before_a_parse_error(
+    run_cli, write_file, jobs: str
+) -> None:  # type: ignore[no-untyped-def]
+    first = write_file("a.py", 'hasattr(obj, "key")\n')
+    broken = write_file("b.py", 'hasattr(obj, "key"\n')
+    with pytest.raises(Exception, match="Syntax Error"):
+        run_cli(["--fix", "--no-cache", "--jobs", jobs, str(first), str(broken)])
+    assert first.read_text() == "hasattr(obj, 'key')\n"
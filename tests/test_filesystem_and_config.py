@@ -2,13 +2,12 @@ from __future__ import annotations
 
 # Copyright (c) 2025 kynguyen and contributors. All rights reserved.
 # Licensed under the MIT license. See LICENSE file in the project root for details.
-from typing import TYPE_CHECKING
+from pathlib import Path, PurePosixPath
 
-from sqk.config import Config
-from sqk.filesystem import is_path_excluded, read_pyproject_excludes
+import pytest
 
-if TYPE_CHECKING:
-    from pathlib import Path
+from sqk.config import Config
+from sqk.filesystem import compile_excludes, is_path_excluded, read_pyproject_excludes
 
 
 def test_read_pyproject_excludes(tmp_path: Path) -> None:
@@ -40,3 +39,59 @@ exclude = ["**/skip.py"]
     cfg = Config.discover(tmp_path)
     assert cfg.is_excluded(tmp_path / "a" / "skip.py") is True
     assert cfg.is_excluded(tmp_path / "a" / "keep.py") is False
+
+
+def test_read_pyproject_excludes_sees_edits(tmp_path: Path) -> None:
+    proj = tmp_path / "pyproject.toml"
+    proj.write_text('[tool.single-quote-keys]\nexclude = ["a.py"]\n')
+    assert read_pyproject_excludes(tmp_path) == {"a.py"}
+    proj.write_text('[tool.single-quote-keys]\nexclude = ["a.py", "b.py"]\n')
+    assert read_pyproject_excludes(tmp_path) == {"a.py", "b.py"}
+
+
+def test_read_pyproject_excludes_sees_created_and_deleted(tmp_path: Path) -> None:
+    assert read_pyproject_excludes(tmp_path) == set()
+    proj = tmp_path / "pyproject.toml"
+    proj.write_text('[tool.single-quote-keys]\nexclude = ["a.py"]\n')
+    assert read_pyproject_excludes(tmp_path) == {"a.py"}
+    proj.unlink()
+    assert read_pyproject_excludes(tmp_path) == set()
+
+
+@pytest.mark.parametrize(
+    ("pattern", "path"),
+    [
+        ("*.py", "pkg/a.py"),
+        ("pkg/*.py", "root/pkg/a.py"),
+        ("pkg/*.py", "root/other/a.py"),
+        ("*/a.py", "a.py"),
+        ("/pkg/a.py", "/pkg/a.py"),
+        ("/pkg/a.py", "/root/pkg/a.py"),
+        ("generated_?.py", "x/generated_1.py"),
+        ("[ab].py", "x/b.py"),
+        ("[!ab].py", "x/c.py"),
+        ("[!ab].py", "x/a.py"),
+        ("[!]]", "x/a"),
+        ("[!]]", "x/]"),
+        ("gen_[z-a].py", "gen_a.py"),
+        ("[b-[!]]", "x/c]"),
+        ("a*.py", "ab/c.py"),
+    ],
+)
+def test_compiled_excludes_follow_pure_path_match(pattern: str, path: str) -> None:
+    regex = compile_excludes([pattern])
+    assert regex is not None
+    expected = PurePosixPath(path).match(pattern)
+    assert (regex.search(path) is not None) is expected
+
+
+def test_config_filter_paths(tmp_path: Path) -> None:
+    (tmp_path / "pyproject.toml").write_text(
+        """
+[tool.single-quote-keys]
+exclude = ["**/skip.py", "gen/*"]
+"""
+    )
+    cfg = Config.discover(tmp_path)
+    paths = ["a/skip.py", "a/keep.py", "./gen/x.py", "keep.py", "skip.py"]
+    assert cfg.filter_paths(paths) == ["a/keep.py", "keep.py", "skip.py"]
@@ -2,10 +2,24 @@ from __future__ import annotations
 
 # Copyright (c) 2025 kynguyen and contributors. All rights reserved.
 # Licensed under the MIT license. See LICENSE file in the project root for details.
+import ast
+from typing import TYPE_CHECKING
+
 import libcst as cst
 import pytest
 
-from sqk.strings import is_single_quoted, is_triple_quoted, to_single_quoted_string
+from sqk.strings import (
+    is_single_quoted,
+    is_triple_quoted,
+    parse_prefix,
+    rewrite_preferred_quotes,
+    rewrite_single_quotes,
+    to_double_quoted_string,
+    to_single_quoted_string,
+)
+
+if TYPE_CHECKING:
+    from collections.abc import Callable
 
 
 @pytest.mark.parametrize(
@@ -17,6 +31,8 @@ from sqk.strings import is_single_quoted, is_triple_quoted, to_single_quoted_str
         ('u"a"', False),
         ("'''a'''", False),
         ('"""a"""', False),
+        ("Rb'a'", True),
+        ("u'''a'''", False),
     ],
 )
 def test_is_single_quoted(token: str, expected: bool) -> None:
@@ -30,12 +46,33 @@ def test_is_single_quoted(token: str, expected: bool) -> None:
         ('"""a"""', True),
         ("'a'", False),
         ('"a"', False),
+        ('rB"""a"""', True),
+        ("b''", False),
     ],
 )
 def test_is_triple_quoted(token: str, expected: bool) -> None:
     assert is_triple_quoted(token) is expected
 
 
+@pytest.mark.parametrize(
+    ("token", "raw", "bytes_", "unicode", "prefix"),
+    [
+        ('"a"', False, False, False, ""),
+        ("u'a'", False, False, True, "u"),
+        ('Rb"a"', True, True, False, "Rb"),
+        ("br'''a'''", True, True, False, "br"),
+    ],
+)
+def test_parse_prefix(
+    token: str, raw: bool, bytes_: bool, unicode: bool, prefix: str
+) -> None:
+    parsed = parse_prefix(token)
+    assert parsed.has_raw is raw
+    assert parsed.has_bytes is bytes_
+    assert parsed.has_unicode is unicode
+    assert parsed.raw_prefix == prefix
+
+
 @pytest.mark.parametrize(
     ("token", "changed"),
     [
@@ -52,3 +89,61 @@ def test_to_single_quoted_string_behavior(token: str, changed: bool) -> None:
     assert (new is not None) is changed
     if new is not None:
         assert new.value.startswith("'")
+
+
+def test_converters_keep_parentheses() -> None:
+    node = cst.SimpleString('"a"', lpar=[cst.LeftParen()], rpar=[cst.RightParen()])
+    single = to_single_quoted_string(node)
+    assert single is not None
+    assert cst.Module([]).code_for_node(single) == "('a')"
+    double = to_double_quoted_string(single)
+    assert double is not None
+    assert cst.Module([]).code_for_node(double) == '("a")'
+
+
+@pytest.mark.parametrize(
+    ("token", "expected"),
+    [
+        ("'café'", '"café"'),
+        ("'say \\'hi\\''", "\"say 'hi'\""),
+        ("'tab\\t\\x00'", '"tab\\t\\x00"'),
+        ("'a\\u200bb'", '"a\\u200bb"'),
+    ],
+)
+def test_to_double_quoted_string_escapes(token: str, expected: str) -> None:
+    new = to_double_quoted_string(cst.SimpleString(token))
+    assert new is not None
+    assert new.value == expected
+    assert ast.literal_eval(new.value) == ast.literal_eval(token)
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        '"a"',
+        "'a'",
+        'u"café"',
+        '"tab\\there"',
+        '"\\x41\\101\\u00e9\\N{BULLET}"',
+        '"quote \\" inside"',
+        '"café \\n"',
+        '"line\\\ncontinued"',
+        '"line\\\r\ncontinued"',
+        '"line\\\rcontinued"',
+    ],
+)
+@pytest.mark.parametrize("rewrite", [rewrite_preferred_quotes, rewrite_single_quotes])
+def test_rewrites_keep_literal_value(
+    rewrite: Callable[[str], str | None], token: str
+) -> None:
+    new_token = rewrite(token)
+    if new_token is not None:
+        assert ast.literal_eval(new_token) == ast.literal_eval(token)
+
+
+@pytest.mark.parametrize("token", ['r"a"', 'b"a"', '"""a"""', "'''a'''"])
+@pytest.mark.parametrize("rewrite", [rewrite_preferred_quotes, rewrite_single_quotes])
+def test_rewrites_skip_raw_bytes_and_triple(
+    rewrite: Callable[[str], str | None], token: str
+) -> None:
+    assert rewrite(token) is None
@@ -2,9 +2,15 @@ from __future__ import annotations
 
 # Copyright (c) 2025 kynguyen and contributors. All rights reserved.
 # Licensed under the MIT license. See LICENSE file in the project root for details.
+from typing import TYPE_CHECKING
+
+import libcst as cst
 import pytest
 
-from sqk.processor import transform_code
+from sqk.processor import process_files, transform_code
+
+if TYPE_CHECKING:
+    from pathlib import Path
 
 
 @pytest.mark.parametrize(
@@ -108,8 +114,8 @@ def test_fromkeys(code: str, expected: str) -> None:
 
 def test_noqa_inline() -> None:
     code = 'hasattr(obj, "key")  # noqa: quote-keys'
-    out, changed = transform_code(code)
-    assert out == code
+    out, changed = transform_code.__wrapped__(code)
+    assert out is code
     assert changed is False
 
 
@@ -122,8 +128,8 @@ def test_noqa_inline() -> None:
     ],
 )
 def test_raw_and_triple_are_unchanged(code: str) -> None:
-    out, changed = transform_code(code)
-    assert out == code
+    out, changed = transform_code.__wrapped__(code)
+    assert out is code
     assert changed is False
 
 
@@ -141,3 +147,128 @@ def test_comprehensions(code: str, expected: str) -> None:
     out, changed = transform_code(code)
     assert out == expected
     assert changed is True
+
+
+def test_noqa_applies_per_line() -> None:
+    code = 'hasattr(obj, "a")  #noqa: quote-keys\nhasattr(obj, "b")\n'
+    out, changed = transform_code(code)
+    assert out == "hasattr(obj, \"a\")  #noqa: quote-keys\nhasattr(obj, 'b')\n"
+    assert changed is True
+
+
+@pytest.mark.parametrize("newline", ["\r\n", "\r"])
+def test_noqa_lines_follow_libcst_line_breaks(newline: str) -> None:
+    code = newline.join(["x = 1", 'hasattr(obj, "a")  #noqa: quote-keys', ""])
+    out, changed = transform_code(code)
+    assert 'hasattr(obj, "a")' in out
+    assert changed is False
+
+
+def test_file_level_noqa_disables_every_line() -> None:
+    code = 'x = d["a"]  # noqa: quote-keys\ny = d["b"]\n'
+    out, changed = transform_code.__wrapped__(code)
+    assert out is code
+    assert changed is False
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        (
+            'hasattr(obj, "a")  # NOQA: E501,quote-keys\nd["b"]\n',
+            "hasattr(obj, \"a\")  # NOQA: E501,quote-keys\nd['b']\n",
+        ),
+        # The tag outside a noqa comment does not opt the line out.
+        ('d["quote-keys"]  #noqa: E501\n', "d['quote-keys']  #noqa: E501\n"),
+    ],
+)
+def test_noqa_requires_a_noqa_comment_with_the_tag(code: str, expected: str) -> None:
+    out, _ = transform_code(code)
+    assert out == expected
+
+
+def test_source_without_quotes_is_returned_as_is() -> None:
+    code = "x = compute(1, y)\n"
+    out, changed = transform_code.__wrapped__(code)
+    assert out is code
+    assert changed is False
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        'get("a")',
+        'fromkeys(["a"])',
+        '__getattr__(obj, "a")',
+        'factory()("a")',
+    ],
+)
+def test_method_only_names_require_attribute_calls(code: str) -> None:
+    out, changed = transform_code(code)
+    assert out == code
+    assert changed is False
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "d['a'] = \"text\"\n",
+        "{'a': getattr(obj, 'b')}\n",
+        "dict([('a', 1)])\n",
+    ],
+)
+def test_already_normalized_source_is_returned_as_is(code: str) -> None:
+    out, changed = transform_code.__wrapped__(code)
+    assert out is code
+    assert changed is False
+
+
+def test_keys_without_key_calls_are_still_rewritten() -> None:
+    # No call name in the source matches a key rule; dict and subscript keys
+    # and textual strings are still handled.
+    code = 'x = {"a": d["b"]}\nprint(\'c\', "it\'s")\n'
+    out, changed = transform_code(code)
+    assert out == "x = {'a': d['b']}\nprint(\"c\", \"it's\")\n"
+    assert changed is True
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "x = f\"{d.get('a') or 'b'}\"\n",
+        "x = f'{d[\"a\"]}'\n",
+    ],
+)
+def test_fstring_replacement_fields_are_left_alone(code: str) -> None:
+    out, changed = transform_code(code)
+    assert out == code
+    assert changed is False
+
+
+def test_unchanged_module_skips_code_generation(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def fail(_self: cst.Module) -> str:
+        pytest.fail("module code was generated for an unchanged source")
+
+    monkeypatch.setattr(cst.Module, "code", property(fail))
+    code = "d['a'] = hasattr(obj, r\"b\")\n"
+    out, changed = transform_code.__wrapped__(code)
+    assert out is code
+    assert changed is False
+
+
+def test_process_files_in_workers_returns_original_for_unchanged(
+    tmp_path: Path,
+) -> None:
+    sources = {"a.py": 'd["a"]\n', "b.py": "d['b']\n", "c.py": "x = 1\n"}
+    paths = []
+    for name, src in sources.items():
+        (tmp_path / name).write_text(src)
+        paths.append(tmp_path / name)
+    results = list(process_files(paths, jobs=2))
+    assert [(r.path.name, r.changed, r.code) for r in results] == [
+        ("a.py", True, "d['a']\n"),
+        ("b.py", False, "d['b']\n"),
+        ("c.py", False, "x = 1\n"),
+    ]
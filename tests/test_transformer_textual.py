@@ -5,6 +5,7 @@ from __future__ import annotations
 import pytest
 
 from sqk.processor import transform_code
+from sqk.textual import rewrite_textual_tokens
 
 
 @pytest.mark.parametrize(
@@ -16,8 +17,45 @@ from sqk.processor import transform_code
         ('s = "foo\\"bar"', "s = 'foo\"bar'"),
         # Prefer double quotes if the content contains a single quote
         ("s = 'foo\\'bar'", 's = "foo\'bar"'),
+        # Byte strings are left alone
+        ("data = b'abc'", "data = b'abc'"),
     ],
 )
 def test_textual_strings_are_double_quoted(code: str, expected: str) -> None:
     out, _ = transform_code(code)
     assert out == expected
+
+
+@pytest.mark.parametrize(
+    ("code", "expected"),
+    [
+        ("__all__ = ['a', 'b']\n", '__all__ = ["a", "b"]\n'),
+        (
+            "x = [['a']]\nreturn_ = f'{x}' + 'y'\n",
+            'x = [["a"]]\nreturn_ = f\'{x}\' + "y"\n',
+        ),
+        (
+            "if a in ('b',\n        'c'):  # 'd'\n    pass\n",
+            'if a in ("b",\n        "c"):  # \'d\'\n    pass\n',
+        ),
+    ],
+)
+def test_textual_token_path_rewrites_non_key_literals(code: str, expected: str) -> None:
+    assert rewrite_textual_tokens(code) == (expected, True)
+    assert transform_code(code) == (expected, True)
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "d['a']\n",
+        "d[('a')]\n",
+        "x = {'a': 1}\n",
+        "d = dict(a='b')\n",
+        "x = y.get('a')\n",
+        "x = (\n    y\n    ['a']\n)\n",
+        "x = 'unterminated\n",
+    ],
+)
+def test_textual_token_path_defers_possible_keys(code: str) -> None:
+    assert rewrite_textual_tokens(code) is None